@@ -1,10 +1,7 @@
 import os
-import yaml
 import collections
 import os.path as op
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 from psychopy import core
 from psychopy.sound import Sound
 # mri emulator not needed for EEG experiments, therefore exclude it
@@ -63,17 +60,9 @@ class Session:
         self.exp_start = None
         self.exp_stop = None
         self.current_trial = None
-        self.global_log = pd.DataFrame(
-            columns=[
-                "trial_nr",
-                "onset",
-                "event_type",
-                "phase",
-                "response",
-                "nr_frames",
-            ]
-        )
+        self.global_log = []  # list of dicts (one per event), see close()
         self.nr_frames = 0  # keeps track of nr of nr of frame flips
+        self._text_cache = {}  # TextStims of display_text, keyed by kwargs
         self.first_trial = True
         self.closed = False
 
@@ -95,11 +84,18 @@ class Session:
 
     def _load_settings(self):
         """Loads settings and sets preferences."""
+        import yaml
+
+        try:
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:  # PyYAML built without libyaml
+            from yaml import SafeLoader
+
         default_settings_path = op.join(
             op.dirname(op.dirname(__file__)), "data", "default_settings.yml"
         )
         with open(default_settings_path, "r", encoding="utf8") as f_in:
-            default_settings = yaml.safe_load(f_in)
+            default_settings = yaml.load(f_in, Loader=SafeLoader)
 
         if self.settings_file is None:
             settings = default_settings
@@ -109,7 +105,7 @@ class Session:
                 raise IOError(f"Settings-file {self.settings_file} does not exist!")
 
             with open(self.settings_file, "r", encoding="utf8") as f_in:
-                user_settings = yaml.safe_load(f_in)
+                user_settings = yaml.load(f_in, Loader=SafeLoader)
 
             # Update (and potentially overwrite) default settings
             _merge_settings(default_settings, user_settings)
@@ -225,7 +221,8 @@ class Session:
         keys : str or list[str]
             String (or list of strings) of keyname(s) to wait for
         kwargs : key-word args
-            Any (set of) parameter(s) passed to TextStim
+            Any (set of) parameter(s) passed to TextStim. The TextStim is
+            reused across calls with the same kwargs
         """
         if keys is None and duration is None:
             raise ValueError("Please set either 'keys' or 'duration'!")
@@ -233,7 +230,19 @@ class Session:
         if keys is not None and duration is not None:
             raise ValueError("Cannot set both 'keys' and 'duration'!")
 
-        stim = TextStim(self.win, text=text, **kwargs)
+        try:
+            cache_key = tuple(sorted(kwargs.items()))
+            stim = self._text_cache.get(cache_key)
+        except TypeError:  # unhashable kwargs (e.g., lists); don't cache
+            cache_key, stim = None, None
+
+        if stim is None:
+            stim = TextStim(self.win, text=text, **kwargs)
+            if cache_key is not None:
+                self._text_cache[cache_key] = stim
+        elif stim.text != text:
+            stim.setText(text)
+
         stim.draw()
         self.win.flip()
 
@@ -250,6 +259,10 @@ class Session:
         if self.closed:  # already closed!
             return None
 
+        # Only needed here, so not imported at module level (slow imports)
+        import pandas as pd
+        import matplotlib.pyplot as plt
+
         self.win.callOnFlip(self._set_exp_stop)
         self.win.flip()
         self.win.recordFrameIntervals = False
@@ -259,27 +272,37 @@ class Session:
         if not op.isdir(self.output_dir):
             os.makedirs(self.output_dir)
 
-        self.global_log = pd.DataFrame(self.global_log).set_index("trial_nr")
-        self.global_log["onset_abs"] = self.global_log["onset"] + self.exp_start
+        # Events are buffered as dicts during the experiment; only build
+        # the DataFrame once, here (keeping the base columns up front)
+        log_cols = ["trial_nr", "onset", "event_type", "phase", "response", "nr_frames"]
+        self.global_log = pd.DataFrame(self.global_log)
+        self.global_log = self.global_log.reindex(
+            columns=log_cols + [c for c in self.global_log.columns if c not in log_cols]
+        ).set_index("trial_nr")
+        onset = self.global_log["onset"].to_numpy(dtype=np.float64)
+        self.global_log["onset_abs"] = np.round(onset + self.exp_start, 5)
 
         # Only non-responses have a duration
-        nonresp_idx = ~self.global_log.event_type.isin(["response", "trigger", "pulse"])
-        last_phase_onset = self.global_log.loc[nonresp_idx, "onset"].iloc[-1]
-        dur_last_phase = self.exp_stop - last_phase_onset
-        durations = np.append(
-            self.global_log.loc[nonresp_idx, "onset"].diff().values[1:], dur_last_phase
-        )
+        nonresp_idx = ~self.global_log.event_type.isin(
+            ["response", "trigger", "pulse"]
+        ).to_numpy()
+        phase_onsets = onset[nonresp_idx]
+        durations = np.empty_like(phase_onsets)
+        durations[:-1] = np.diff(phase_onsets)
+        durations[-1] = self.exp_stop - phase_onsets[-1]  # last phase ends at exp_stop
         self.global_log.loc[nonresp_idx, "duration"] = durations
 
-        # Same for nr frames
+        # Same for nr frames (nullable ints, as responses have no nr_frames)
         nr_frames = np.append(
-            self.global_log.loc[nonresp_idx, "nr_frames"].values[1:], self.nr_frames
+            self.global_log["nr_frames"].to_numpy()[nonresp_idx][1:], self.nr_frames
         )
+        self.global_log["nr_frames"] = self.global_log["nr_frames"].astype("Int64")
         self.global_log.loc[nonresp_idx, "nr_frames"] = nr_frames.astype(int)
 
         # Round for readability and save to disk
-        self.global_log = self.global_log.round(
-            {"onset": 5, "onset_abs": 5, "duration": 5}
+        self.global_log["onset"] = np.round(onset, 5)
+        self.global_log["duration"] = np.round(
+            self.global_log["duration"].to_numpy(dtype=np.float64), 5
         )
         f_out = op.join(self.output_dir, self.output_str + "_events.tsv")
         self.global_log.to_csv(f_out, sep="\t", index=True)
@@ -315,9 +338,10 @@ class Session:
 
 
 def _merge_settings(default, user):
-    """Recursive dict merge. Inspired by dict.update(), instead of
-    updating only top-level keys, dict_merge recurses down into dicts nested
-    to an arbitrary depth, updating keys. The merge_dct is merged into
+    """Nested dict merge. Inspired by dict.update(), instead of
+    updating only top-level keys, dict_merge descends into dicts nested
+    to an arbitrary depth, updating keys. Uses an explicit stack instead of
+    recursion. The merge_dct is merged into
     Adapted from https://gist.github.com/angstwad/bf22d1822c38a92ec0a9.
 
     Parameters
@@ -331,12 +355,15 @@ def _merge_settings(default, user):
     -------
     None
     """
-    for k, v in user.items():
-        if (
-            k in default
-            and isinstance(default[k], dict)
-            and isinstance(user[k], collections.abc.Mapping)
-        ):
-            _merge_settings(default[k], user[k])
-        else:
-            default[k] = user[k]
+    stack = [(default, user)]
+    while stack:
+        default, user = stack.pop()
+        for k, v in user.items():
+            if (
+                k in default
+                and isinstance(default[k], dict)
+                and isinstance(v, collections.abc.Mapping)
+            ):
+                stack.append((default[k], v))
+            else:
+                default[k] = v
@@ -1,5 +1,4 @@
 import numpy as np
-import pandas as pd
 from psychopy import core
 from psychopy import event
 from psychopy import logging
@@ -29,6 +28,7 @@ class Trial:
             optional (if None, all are named 'stim')
         parameters : dict
             Dict of parameters that needs to be added to the log of this trial
+            (array/list values are logged as one column per element)
         timing : str
             The "units" of the phase durations. Default is 'seconds', where we
             assume the phase-durations are in seconds. The other option is
@@ -95,6 +95,19 @@ class Trial:
                 raise ValueError("Durations should be integers when timing "
                                  "is set to 'frames'!")
 
+    def _flatten_params(self):
+        """ Flattens parameters for logging (once per phase onset and once per
+        batch of responses, so changes during the trial are logged). """
+        flat_params = dict()
+        for param, val in self.parameters.items():
+            if type(val) == np.ndarray or type(val) == list:
+                for i, x in enumerate(val):
+                    flat_params[f'{param}_{i:04d}'] = x
+            else:
+                flat_params[param] = val
+
+        return flat_params
+
     def draw(self):
         """ Should be implemented in child Class. """
         raise NotImplementedError
@@ -134,19 +147,11 @@ class Trial:
             # Should be log more to the eyetracker? Like 'parameters'?
 
         # add to global log
-        idx = self.session.global_log.shape[0]
-        self.session.global_log.loc[idx, 'onset'] = onset
-        self.session.global_log.loc[idx, 'trial_nr'] = self.trial_nr
-        self.session.global_log.loc[idx, 'event_type'] = self.phase_names[phase]
-        self.session.global_log.loc[idx, 'phase'] = phase
-        self.session.global_log.loc[idx, 'nr_frames'] = self.session.nr_frames
-
-        for param, val in self.parameters.items():  # add parameters to log
-            if type(val) == np.ndarray or type(val) == list:
-                for i, x in enumerate(val):
-                    self.session.global_log.loc[idx, param+'_%4i'%i] = str(x) 
-            else:       
-                self.session.global_log.loc[idx, param] = val
+        rec = {'trial_nr': self.trial_nr, 'onset': onset,
+               'event_type': self.phase_names[phase], 'phase': phase,
+               'nr_frames': self.session.nr_frames}
+        rec.update(self._flatten_params())  # add parameters to log
+        self.session.global_log.append(rec)
 
         # add to trial_log
         #idx = self.trial_log.shape[0]
@@ -171,28 +176,23 @@ class Trial:
                 self.session.close()
                 self.session.quit()
 
+            # Bind once, instead of once per key
+            mri_trigger = self.session.mri_trigger
+            global_log = self.session.global_log
+            flat_params = self._flatten_params()
+
             for key, t in events:
 
-                if key == self.session.mri_trigger:
+                if key == mri_trigger:
                     event_type = 'pulse'
                 else:
                     event_type = 'response'
 
-                idx = self.session.global_log.shape[0]
-                self.session.global_log.loc[idx, 'trial_nr'] = self.trial_nr
-                self.session.global_log.loc[idx, 'onset'] = t
-                self.session.global_log.loc[idx, 'event_type'] = event_type
-                self.session.global_log.loc[idx, 'phase'] = self.phase
-                self.session.global_log.loc[idx, 'response'] = key
-
-                # for param, val in self.parameters.items():
-                    # self.session.global_log.loc[idx, param] = val
-                for param, val in self.parameters.items():  # add parameters to log
-                    if type(val) == np.ndarray or type(val) == list:
-                        for i, x in enumerate(val):
-                            self.session.global_log.loc[idx, param+'_%4i'%i] = x 
-                    else:       
-                        self.session.global_log.loc[idx, param] = val
+                rec = {'trial_nr': self.trial_nr, 'onset': t,
+                       'event_type': event_type, 'phase': self.phase,
+                       'response': key}
+                rec.update(flat_params)  # add parameters to log
+                global_log.append(rec)
 
                 if self.eyetracker_on:  # send msg to eyetracker
                     msg = f'start_type-{event_type}_trial-{self.trial_nr}_phase-{self.phase}_key-{key}_time-{t}'
@@ -202,7 +202,7 @@ class Trial:
                 #self.trial_log['response_onset'][self.phase].append(t)
                 #self.trial_log['response_time'][self.phase].append(t - self.start_trial)
 
-                if key != self.session.mri_trigger:
+                if key != mri_trigger:
                     self.last_resp = key
                     self.last_resp_onset = t
 
@@ -234,25 +234,32 @@ class Trial:
     def run(self):
         """ Runs through phases. Should not be subclassed unless
         really necessary. """
+        session = self.session
 
         if self.eyetracker_on:  # Sets status message
             cmd = f"record_status_message 'trial {self.trial_nr}'"
-            self.session.tracker.sendCommand(cmd)
+            session.tracker.sendCommand(cmd)
 
         # Because the first flip happens when the experiment starts,
         # we need to compensate for this during the first trial/phase
-        if self.session.first_trial:
+        if session.first_trial:
             # must be first trial/phase
             if self.timing == 'seconds':  # subtract duration of one frame
-                self.phase_durations[0] -= 1./self.session.actual_framerate * 1.1  # +10% to be sure
+                self.phase_durations[0] -= 1./session.actual_framerate * 1.1  # +10% to be sure
             else:  # if timing == 'frames', subtract one frame 
                 self.phase_durations[0] -= 1
             
-            self.session.first_trial = False
+            session.first_trial = False
+
+        # Bind everything that is used every frame once
+        timer_get = session.timer.getTime
+        flip = session.win.flip
+        draw = self.draw
+        get_events = self.get_events
 
         for phase_dur in self.phase_durations:  # loop over phase durations
             # pass self.phase *now* instead of while logging the phase info.
-            self.session.win.callOnFlip(self.log_phase_info, phase=self.phase)
+            session.win.callOnFlip(self.log_phase_info, phase=self.phase)
 
             # Start loading in next trial during this phase (if not None)
             if self.load_next_during_phase == self.phase:
@@ -260,13 +267,13 @@ class Trial:
 
             if self.timing == 'seconds':
                 # Loop until timer is at 0!
-                self.session.timer.add(phase_dur)
-                while self.session.timer.getTime() < 0 and not self.exit_phase and not self.exit_trial:
-                    self.draw()
+                session.timer.add(phase_dur)
+                while timer_get() < 0 and not self.exit_phase and not self.exit_trial:
+                    draw()
                     if self.draw_each_frame:
-                        self.session.win.flip()
-                        self.session.nr_frames += 1
-                    self.get_events()
+                        flip()
+                        session.nr_frames += 1
+                    get_events()
             else:
                 # Loop for a predetermined number of frames
                 # Note: only works when you're sure you're not 
@@ -276,16 +283,16 @@ class Trial:
                     if self.exit_phase or self.exit_trial:
                         break
 
-                    self.draw()
-                    self.session.win.flip()
-                    self.get_events()
-                    self.session.nr_frames += 1
+                    draw()
+                    flip()
+                    get_events()
+                    session.nr_frames += 1
 
             if self.exit_phase:  # broke out of phase loop
-                self.session.timer.reset()  # reset timer!
+                session.timer.reset()  # reset timer!
                 self.exit_phase = False  # reset exit_phase
             if self.exit_trial:
-                self.session.timer.reset()
+                session.timer.reset()
                 break
 
             self.phase += 1  # advance phase
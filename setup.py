@@ -57,7 +57,7 @@ PACKAGES = find_packages()
 REQUIRES = [
     'psychopy>=3.0.4',
     'pyyaml',
-    'pandas>=0.23.0',
+    'pandas>=0.24',
     'numpy>=1.14.3',
     'msgpack_numpy'
 ]